@@ -1,15 +1,203 @@
+import base64
+import math
+import os
+from functools import lru_cache
+
 import numpy as np
 import plotly.graph_objects as go
-from dash import Dash, dcc, html
+from dash import Dash, Patch, ctx, dcc, html, no_update
 from dash.dependencies import Input, Output
 import dash_daq as daq
+from flask_caching import Cache
+
+# Normierte Abklingkurve e^(-s) auf s ∈ [0, 5] einmal beim Import berechnen.
+# Alle Parameterkombinationen skalieren nur diese Kurve, d.h. im Callback
+# bleiben reine Multiplikationen übrig statt exp-Auswertungen.
+# Das Gitter ist logarithmisch verdichtet: viele Stützstellen nahe t = 0,
+# wo sich die Exponentialkurve schnell ändert, wenige Richtung 5·τ, wo sie
+# praktisch flach ist. 120 Punkte reichen so optisch für die alten 500.
+# float32 statt float64: für die Darstellung mehr als genau genug und
+# halbiert die an den Browser geschickte Nutzlast
+_S = np.expm1(np.linspace(0.0, np.log(6.0), 120, dtype=np.float32))
+_E_DECAY = np.exp(-_S)
+# expm1 statt 1 - exp: vermeidet Auslöschung für kleine s nahe t = 0
+_E_CHARGE = -np.expm1(-_S)
+for _arr in (_S, _E_DECAY, _E_CHARGE):
+    _arr.setflags(write=False)
+
+
+def _make_figure(trace_name, yaxis_title):
+    """Leere Figur mit fertigem Layout, τ-Linie und τ-Annotation.
+
+    Die Figuren werden einmal beim Import gebaut; der Callback schickt per
+    Patch nur noch die Kurvendaten und die τ-Position an den Client statt
+    jedes Mal komplette Figuren zu serialisieren.
+    """
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(x=[], y=[], mode="lines", name=trace_name))
+    # Vertikale Linie bei t = τ (Position kommt per Patch)
+    fig.add_vline(x=0, line_dash="dash", line_width=1)
+    fig.add_annotation(
+        x=0,
+        y=0,
+        text="t = τ",
+        showarrow=True,
+        arrowhead=2,
+        yshift=20
+    )
+    fig.update_layout(
+        xaxis_title="Zeit t [ms]",
+        yaxis_title=yaxis_title,
+        template="plotly_white",
+        margin=dict(l=40, r=10, t=10, b=40),
+        uirevision="rc",  # WebGL-Kontext über Callback-Updates hinweg behalten
+    )
+    return fig
+
+
+_FIG_U = _make_figure("U_C(t)", "Spannung U_C [V]")
+_FIG_Q = _make_figure("Q(t)", "Ladung Q [mC]")
+_FIG_I = _make_figure("I(t)", "Strom I [mA] (Vorzeichen = Richtung)")
+
+
+# Vorgebundener Format-Aufruf für den Info-Text (spart den Methoden-Lookup
+# und die f-String-Fragment-Konkatenation pro Aufruf)
+_INFO_FMT = (
+    "R = {:.0f} Ω, "
+    "C = {:.0f} µF, "
+    "U₀ = {:.1f} V → "
+    "Zeitkonstante τ = {:.2f} ms, "
+    "Darstellung von t = 0 bis {:.2f} ms"
+).format
+
+
+def _typed_array(arr):
+    """float32-Array in Plotlys Typed-Array-Form bringen.
+
+    {"dtype": "f4", "bdata": ...} wird von plotly.js direkt als
+    Float32Array gelesen; base64 ist kompakter als die Dezimalliste und
+    erspart dem Client das Parsen von 120 Zahlen-Literalen.
+    """
+    return {
+        "dtype": "f4",
+        "bdata": base64.b64encode(np.ascontiguousarray(arr)).decode("ascii"),
+    }
+
+
+def _patch_figure(t_ms, tau_ms, y, y_annot, yshift=20):
+    """Patch mit neuen Kurvendaten und τ-Marker für eine der drei Figuren.
+
+    Layout, Achsen und Titel stecken bereits in den beim Import gebauten
+    Figuren und werden nicht erneut übertragen. Mit t_ms=None bleiben auch
+    Zeitachse und τ-Position unangetastet (z.B. beim reinen Moduswechsel).
+    """
+    p = Patch()
+    if t_ms is not None:
+        p["data"][0]["x"] = _typed_array(t_ms)
+        p["layout"]["shapes"][0]["x0"] = tau_ms
+        p["layout"]["shapes"][0]["x1"] = tau_ms
+        p["layout"]["annotations"][0]["x"] = tau_ms
+    p["data"][0]["y"] = _typed_array(y)
+    p["layout"]["annotations"][0]["y"] = y_annot
+    p["layout"]["annotations"][0]["yshift"] = yshift
+    return p
 
 # Dash-App + WSGI-Server (für Azure wichtig)
 app = Dash(__name__)
 server = app.server
 
+# Server-seitiger Cache für die Callback-Ergebnisse. SimpleCache genügt für
+# einen Worker; bei mehreren gunicorn-Workern per CACHE_TYPE=RedisCache und
+# CACHE_REDIS_URL auf einen gemeinsamen Redis-Backend umstellen.
+cache = Cache(server, config={
+    "CACHE_TYPE": os.environ.get("CACHE_TYPE", "SimpleCache"),
+    "CACHE_DEFAULT_TIMEOUT": 3600,
+})
+
 app.title = "RC-Kreis Visualisierung"
 
+# Schaltplan- und Theorie-Markdown werden erst beim Öffnen des zweiten Tabs
+# gerendert (siehe render_theory); das hält die initiale Seite klein und
+# spart den MathJax-Parse, solange niemand den Tab anklickt.
+_MD_STYLE = {"background": "#f5f5f7", "padding": "1rem", "borderRadius": "8px"}
+
+_SCHEMATIC_MD = """
+```text
+         + U₀
+         │ │
+         │ │
+   +─────┴─┴─────+
+   │             │
+   │        ┌────┴────┐
+   │        │   R     │
+   │        └─────────┘
+   │             │
+   │        ┌────┴────┐
+   │        │   C     │
+   │        └─||  ||──┘
+   │             │
+   +─────────────+─── 0 V (Bezug)
+```
+
+- U₀: ideale Gleichspannungsquelle
+- R : Widerstand
+- C : Kondensator
+
+Laden: Kondensator startet ungeladen und wird an U₀ angeschlossen.  
+Entladen: Kondensator ist anfangs auf U₀ geladen und entlädt sich nur über R.
+"""
+
+_THEORY_MD = r"""
+### Zeitkonstante $\tau = R \cdot C$
+
+Die Zeitkonstante $\tau$ beschreibt, wie schnell der RC-Kreis reagiert:
+
+- Einheit: Sekunden
+- Nach $t = \tau$ gilt:
+  - Laden: $U_C(\tau) \approx 0{,}63 \cdot U_0$
+  - Entladen: $U_C(\tau) \approx 0{,}37 \cdot U_0$
+
+Nach ungefähr $5 \cdot \tau$ ist der Vorgang praktisch abgeschlossen.
+
+---
+
+### Laden eines RC-Kreises ($U_C(0) = 0\,\text{V}$)
+
+- Spannung:
+  $$U_C(t) = U_0 \cdot \bigl(1 - e^{-t/(R C)}\bigr)$$
+
+- Ladung:
+  $$Q(t) = C \cdot U_C(t)$$
+
+- Strom:
+  $$I(t) = \frac{U_0}{R} \cdot e^{-t/(R C)}$$
+
+(zu Beginn maximal, fällt exponentiell ab)
+
+---
+
+### Entladen eines RC-Kreises ($U_C(0) = U_0$)
+
+- Spannung:
+  $$U_C(t) = U_0 \cdot e^{-t/(R C)}$$
+
+- Ladung:
+  $$Q(t) = C \cdot U_0 \cdot e^{-t/(R C)}$$
+
+- Strom:
+  $$I(t) = -\frac{U_0}{R} \cdot e^{-t/(R C)}$$
+
+(Minus zeigt umgekehrte Stromrichtung)
+
+---
+
+**Einheiten in der App**
+
+- Zeit $t$ in Millisekunden (ms)
+- Ladung $Q$ in Milli-Coulomb (mC)
+- Strom $I$ in Milliampere (mA)
+"""
+
 app.layout = html.Div(
     style={
         "fontFamily": "system-ui, -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif",
@@ -59,7 +247,8 @@ app.layout = html.Div(
                                         5000: "5k",
                                         10000: "10k"
                                     },
-                                    tooltip={"placement": "bottom", "always_visible": True}
+                                    tooltip={"placement": "bottom", "always_visible": True},
+                                    updatemode="mouseup"  # Callback erst beim Loslassen
                                 ),
                             ],
                         ),
@@ -80,7 +269,8 @@ app.layout = html.Div(
                                         100: "100",
                                         1000: "1000",
                                     },
-                                    tooltip={"placement": "bottom", "always_visible": True}
+                                    tooltip={"placement": "bottom", "always_visible": True},
+                                    updatemode="mouseup"
                                 ),
                             ],
                         ),
@@ -96,7 +286,8 @@ app.layout = html.Div(
                                     step=0.5,
                                     value=5.0,
                                     marks={1: "1", 5: "5", 9: "9", 12: "12"},
-                                    tooltip={"placement": "bottom", "always_visible": True}
+                                    tooltip={"placement": "bottom", "always_visible": True},
+                                    updatemode="mouseup"
                                 ),
                             ],
                         ),
@@ -136,115 +327,43 @@ app.layout = html.Div(
             ],
         ),
 
-        # Diagramm-Bereich
-        html.Div(
+        dcc.Tabs(
+            id="content-tabs",
+            value="tab-graphs",
             children=[
-                html.H2("Zeitverläufe", style={"marginTop": 0}),
-                html.P(
-                    "Alle Diagramme zeigen die Zeit von t = 0 bis t = 5·τ. "
-                    "Die gestrichelte Linie markiert die Zeitkonstante τ = R·C.",
-                    style={"fontSize": "0.9rem", "color": "#444"}
-                ),
+                # Diagramm-Bereich
+                dcc.Tab(
+                    label="Zeitverläufe",
+                    value="tab-graphs",
+                    children=[
+                        html.P(
+                            "Alle Diagramme zeigen die Zeit von t = 0 bis t = 5·τ. "
+                            "Die gestrichelte Linie markiert die Zeitkonstante τ = R·C.",
+                            style={"fontSize": "0.9rem", "color": "#444"}
+                        ),
 
-                html.H3("Spannung am Kondensator U_C(t)"),
-                dcc.Graph(id="voltage-graph"),
+                        html.H3("Spannung am Kondensator U_C(t)"),
+                        dcc.Graph(id="voltage-graph", figure=_FIG_U),
 
-                html.H3("Ladung des Kondensators Q(t)"),
-                dcc.Graph(id="charge-graph"),
+                        html.H3("Ladung des Kondensators Q(t)"),
+                        dcc.Graph(id="charge-graph", figure=_FIG_Q),
 
-                html.H3("Strom I(t) durch den Widerstand"),
-                dcc.Graph(id="current-graph"),
+                        html.H3("Strom I(t) durch den Widerstand"),
+                        dcc.Graph(id="current-graph", figure=_FIG_I),
+                    ]
+                ),
+                # Schaltplan + Theorie; Inhalt kommt erst beim Anklicken
+                # des Tabs (render_theory), nicht mit der initialen Seite
+                dcc.Tab(
+                    label="Schaltplan & Theorie",
+                    value="tab-theory",
+                    children=[
+                        dcc.Loading(html.Div(id="theory-content")),
+                    ]
+                ),
             ]
         ),
 
-        html.H2("Schaltplan des RC-Kreises", style={"marginTop": "3rem"}),
-
-        dcc.Markdown(
-            """
-```text
-         + U₀
-         │ │
-         │ │
-   +─────┴─┴─────+
-   │             │
-   │        ┌────┴────┐
-   │        │   R     │
-   │        └─────────┘
-   │             │
-   │        ┌────┴────┐
-   │        │   C     │
-   │        └─||  ||──┘
-   │             │
-   +─────────────+─── 0 V (Bezug)
-```
-
-- U₀: ideale Gleichspannungsquelle
-- R : Widerstand
-- C : Kondensator
-
-Laden: Kondensator startet ungeladen und wird an U₀ angeschlossen.  
-Entladen: Kondensator ist anfangs auf U₀ geladen und entlädt sich nur über R.
-""",
-            style={"background": "#f5f5f7", "padding": "1rem", "borderRadius": "8px"}
-        ),
-
-        html.H2("Theoretischer Hintergrund", style={"marginTop": "2rem"}),
-
-        dcc.Markdown(
-    r"""
-### Zeitkonstante $\tau = R \cdot C$
-
-Die Zeitkonstante $\tau$ beschreibt, wie schnell der RC-Kreis reagiert:
-
-- Einheit: Sekunden  
-- Nach $t = \tau$ gilt:
-  - Laden: $U_C(\tau) \approx 0{,}63 \cdot U_0$
-  - Entladen: $U_C(\tau) \approx 0{,}37 \cdot U_0$
-
-Nach ungefähr $5 \cdot \tau$ ist der Vorgang praktisch abgeschlossen.
-
----
-
-### Laden eines RC-Kreises ($U_C(0) = 0\,\text{V}$)
-
-- Spannung:  
-  $$U_C(t) = U_0 \cdot \bigl(1 - e^{-t/(R C)}\bigr)$$
-
-- Ladung:  
-  $$Q(t) = C \cdot U_C(t)$$
-
-- Strom:  
-  $$I(t) = \frac{U_0}{R} \cdot e^{-t/(R C)}$$  
-
-(zu Beginn maximal, fällt exponentiell ab)
-
----
-
-### Entladen eines RC-Kreises ($U_C(0) = U_0$)
-
-- Spannung:  
-  $$U_C(t) = U_0 \cdot e^{-t/(R C)}$$
-
-- Ladung:  
-  $$Q(t) = C \cdot U_0 \cdot e^{-t/(R C)}$$
-
-- Strom:  
-  $$I(t) = -\frac{U_0}{R} \cdot e^{-t/(R C)}$$  
-
-(Minus zeigt umgekehrte Stromrichtung)
-
----
-
-**Einheiten in der App**
-
-- Zeit $t$ in Millisekunden (ms)  
-- Ladung $Q$ in Milli-Coulomb (mC)  
-- Strom $I$ in Milliampere (mA)
-""",
-    style={"background": "#f5f5f7", "padding": "1rem", "borderRadius": "8px"},
-    mathjax=True,
-),
-
         html.Footer(
             "Hinweis: Es wird ein idealer RC-Kreis ohne parasitäre Widerstände, Leckströme "
             "oder nichtlineare Effekte angenommen.",
@@ -253,6 +372,54 @@ Nach ungefähr $5 \cdot \tau$ ist der Vorgang praktisch abgeschlossen.
     ]
 )
 
+@lru_cache(maxsize=4096)
+@cache.memoize(timeout=3600)
+def _compute(R_ohm, C_micro_f, U0, mode_is_charge):
+    """Numerischer Kern des Callbacks, memoisiert über die Slider-Werte.
+
+    Der Eingaberaum ist klein und diskret (100 R- × 1000 C- × 23 U₀-Werte
+    × 2 Modi), d.h. wiederholte Slider-Stellungen treffen den Cache und
+    kosten nur noch einen Dict-Lookup. lru_cache ist die schnelle
+    prozesslokale Stufe, cache.memoize die teilbare Stufe dahinter (mit
+    Redis-Backend über alle Worker hinweg). Die Arrays werden read-only
+    zurückgegeben, damit Cache-Treffer sie nicht nachträglich verändern.
+    """
+    # Einheiten umrechnen
+    C = C_micro_f * 1e-6  # µF -> F
+    tau = R_ohm * C       # Zeitkonstante in Sekunden
+
+    # Simulationszeit: 0 bis 5 * tau (Slider-Minima garantieren tau > 0)
+    t_max = 5 * tau
+
+    # Q und I sind skalare Vielfache von Uc bzw. (U0 - Uc), es muss also
+    # nur eine Kurve aus den Tabellen gelesen werden:
+    #   Laden:    I = (U0 - Uc) / R
+    #   Entladen: I = -Uc / R
+    # Alle drei Kurven werden in einem zusammenhängenden (3, N)-Block
+    # erzeugt; die out=-Varianten schreiben direkt hinein, ohne Temporäre.
+    out = np.empty((3, _S.size), dtype=np.float32)
+    Uc, Q_mC, I_mA = out
+    if mode_is_charge:
+        # Laden: U_C(0) = 0
+        np.multiply(_E_CHARGE, U0, out=Uc)
+        np.subtract(U0, Uc, out=I_mA)
+        I_mA *= 1e3 / R_ohm                    # A -> mA
+    else:
+        # Entladen: U_C(0) = U0
+        np.multiply(_E_DECAY, U0, out=Uc)
+        np.multiply(Uc, -1e3 / R_ohm, out=I_mA)
+    np.multiply(Uc, C * 1e3, out=Q_mC)         # C -> mC
+
+    t_ms = _S * (tau * 1000.0)
+    for arr in (t_ms, Uc, Q_mC, I_mA):
+        arr.setflags(write=False)
+
+    # Info-Box-Text
+    info_text = _INFO_FMT(R_ohm, C_micro_f, U0, tau * 1000, t_max * 1000)
+
+    return t_ms, Uc, Q_mC, I_mA, tau * 1000.0, info_text
+
+
 @app.callback(
     Output("voltage-graph", "figure"),
     Output("charge-graph", "figure"),
@@ -269,121 +436,55 @@ def update_graphs(R_ohm, C_micro_f, U0, mode_is_charge):
     mode_is_charge = True  -> Laden
     False -> Entladen
     """
-    # Einheiten umrechnen
-    C = C_micro_f * 1e-6  # µF -> F
-    tau = R_ohm * C       # Zeitkonstante in Sekunden
-
-    # Simulationszeit: 0 bis 5 * tau (mindestens etwas > 0)
-    t_max = max(5 * tau, 0.01)
-    t = np.linspace(0, t_max, 500)
+    mode_text = "Modus: Laden" if mode_is_charge else "Modus: Entladen"
 
-    if mode_is_charge:
-        mode_text = "Modus: Laden"
-        # Laden: U_C(0) = 0
-        Uc = U0 * (1 - np.exp(-t / tau))
-        Q = C * Uc
-        I = (U0 / R_ohm) * np.exp(-t / tau)
-    else:
-        mode_text = "Modus: Entladen"
-        # Entladen: U_C(0) = U0
-        Uc = U0 * np.exp(-t / tau)
-        Q = C * U0 * np.exp(-t / tau)
-        I = -(U0 / R_ohm) * np.exp(-t / tau)
-
-    # Info-Box-Text
-    info_text = (
-        f"R = {R_ohm:.0f} Ω, "
-        f"C = {C_micro_f:.0f} µF, "
-        f"U₀ = {U0:.1f} V → "
-        f"Zeitkonstante τ = {tau*1000:.2f} ms, "
-        f"Darstellung von t = 0 bis {t_max*1000:.2f} ms"
+    t_ms, Uc, Q_mC, I_mA, tau_ms, info_text = _compute(
+        R_ohm, C_micro_f, U0, mode_is_charge
     )
 
-    t_ms = t * 1000
-    tau_ms = tau * 1000
-
-    # --- Spannung U_C(t) ---
-    fig_u = go.Figure()
-    fig_u.add_trace(
-        go.Scatter(
-            x=t_ms,
-            y=Uc,
-            mode="lines",
-            name="U_C(t)"
-        )
-    )
-    # Vertikale Linie bei t = τ
-    fig_u.add_vline(x=tau_ms, line_dash="dash", line_width=1)
-    fig_u.add_annotation(
-        x=tau_ms,
-        y=max(Uc),
-        text="t = τ",
-        showarrow=True,
-        arrowhead=2,
-        yshift=20
-    )
-    fig_u.update_layout(
-        xaxis_title="Zeit t [ms]",
-        yaxis_title="Spannung U_C [V]",
-        template="plotly_white",
-        margin=dict(l=40, r=10, t=10, b=40),
+    # Nur das aktualisieren, was vom auslösenden Input abhängt: beim reinen
+    # Moduswechsel bleiben Zeitachse, τ-Marker und Info-Text unverändert,
+    # bei Slider-Änderungen der Modus-Text.
+    mode_only = ctx.triggered_id == "mode-toggle"
+    if mode_only:
+        t_ms = tau_ms = None
+        info_text = no_update
+    elif ctx.triggered_id is not None:
+        mode_text = no_update
+
+    # Die Extrema der monotonen Exponentialkurven sind analytisch bekannt
+    # (Laden: Maximum bei t = 5τ, Entladen und Strom: bei t = 0) — kein
+    # Array-Scan nötig. Der Strom-Anker liegt oberhalb bzw. unterhalb.
+    uc_max = -U0 * math.expm1(-5.0) if mode_is_charge else U0
+    q_max_mc = uc_max * (C_micro_f * 1e-3)   # µF·V -> mC
+    i_peak_ma = (U0 / R_ohm) * 1e3 * (1 if mode_is_charge else -1)
+
+    pu = _patch_figure(t_ms, tau_ms, Uc, uc_max)
+    pq = _patch_figure(t_ms, tau_ms, Q_mC, q_max_mc)
+    pi = _patch_figure(
+        t_ms, tau_ms, I_mA,
+        i_peak_ma,
+        yshift=20 if mode_is_charge else -20
     )
 
-    # --- Ladung Q(t) in mC ---
-    fig_q = go.Figure()
-    fig_q.add_trace(
-        go.Scatter(
-            x=t_ms,
-            y=Q * 1e3,   # C -> mC
-            mode="lines",
-            name="Q(t)"
-        )
-    )
-    fig_q.add_vline(x=tau_ms, line_dash="dash", line_width=1)
-    fig_q.add_annotation(
-        x=tau_ms,
-        y=max(Q * 1e3),
-        text="t = τ",
-        showarrow=True,
-        arrowhead=2,
-        yshift=20
-    )
-    fig_q.update_layout(
-        xaxis_title="Zeit t [ms]",
-        yaxis_title="Ladung Q [mC]",
-        template="plotly_white",
-        margin=dict(l=40, r=10, t=10, b=40),
-    )
+    return pu, pq, pi, info_text, mode_text
 
-    # --- Strom I(t) in mA ---
-    fig_i = go.Figure()
-    fig_i.add_trace(
-        go.Scatter(
-            x=t_ms,
-            y=I * 1e3,   # A -> mA
-            mode="lines",
-            name="I(t)"
-        )
-    )
-    fig_i.add_vline(x=tau_ms, line_dash="dash", line_width=1)
-    # Annotation irgendwo sinnvoll (oberhalb oder unterhalb)
-    y_for_annot = float(np.max(I * 1e3)) if mode_is_charge else float(np.min(I * 1e3))
-    fig_i.add_annotation(
-        x=tau_ms,
-        y=y_for_annot,
-        text="t = τ",
-        showarrow=True,
-        arrowhead=2,
-        yshift=20 if mode_is_charge else -20
-    )
-    fig_i.update_layout(
-        xaxis_title="Zeit t [ms]",
-        yaxis_title="Strom I [mA] (Vorzeichen = Richtung)",
-        template="plotly_white",
-        margin=dict(l=40, r=10, t=10, b=40),
-    )
 
-    return fig_u, fig_q, fig_i, info_text, mode_text
+@app.callback(
+    Output("theory-content", "children"),
+    Input("content-tabs", "value"),
+    prevent_initial_call=True,
+)
+def render_theory(tab):
+    """Schaltplan und Theorie erst beim ersten Öffnen des Tabs rendern."""
+    if tab != "tab-theory":
+        return no_update
+    return [
+        html.H2("Schaltplan des RC-Kreises", style={"marginTop": "1rem"}),
+        dcc.Markdown(_SCHEMATIC_MD, style=_MD_STYLE),
+        html.H2("Theoretischer Hintergrund", style={"marginTop": "2rem"}),
+        dcc.Markdown(_THEORY_MD, style=_MD_STYLE, mathjax=True),
+    ]
 
 
 if __name__ == "__main__":
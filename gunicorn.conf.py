@@ -0,0 +1,11 @@
+# gunicorn-Konfiguration für den Betrieb von app:server (z.B. auf Azure):
+#   gunicorn app:server
+#
+# preload_app importiert app.py einmal im Master-Prozess, bevor die Worker
+# geforkt werden. Die beim Import aufgebauten Kurventabellen und
+# Figur-Templates liegen dadurch copy-on-write in einer gemeinsamen
+# Speicherseite statt einmal pro Worker.
+preload_app = True
+workers = 4
+threads = 2
+worker_class = "gthread"